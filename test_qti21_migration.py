@@ -119,7 +119,7 @@ def main():
     print("\n1. Creating quiz from text...")
     quiz = Quiz(quiz_text, config=config)
     print(f"   ✓ Quiz created: '{quiz.title_xml}'")
-    print(f"   ✓ Questions: {len([q for q in quiz.questions_and_delims if hasattr(q, 'type')])}")
+    print(f"   ✓ Questions: {len(quiz.questions)}")
     
     # Generate QTI 2.1 package
     print("\n2. Generating QTI 2.1 package...")
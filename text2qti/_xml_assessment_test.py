@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2020, Geoffrey M. Poore
+# All rights reserved.
+#
+# Licensed under the BSD 3-Clause License:
+# http://opensource.org/licenses/BSD-3-Clause
+#
+
+"""
+Shared implementation for the QTI 2.1 and QTI 3.0 assessmentTest generators.
+
+Both formats emit the same test structure and differ only in tag names and
+schema locations, so the walk over `questions_and_delims` lives here,
+parameterized by each format's templates.
+"""
+
+import functools
+import io
+import re
+
+from .quiz import GroupEnd, GroupStart, Question, Quiz, TextRegion
+
+
+_NEEDS_ESCAPE = re.compile('[&<>"\']').search
+
+_XML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&apos;',
+})
+
+
+@functools.lru_cache(maxsize=2048)
+def xml_escape(s: str) -> str:
+    """Basic XML escaping."""
+    # Titles and identifiers usually contain no metacharacters; skip the
+    # translate pass (and its allocation) when there is nothing to escape
+    if _NEEDS_ESCAPE(s) is None:
+        return s
+    return s.translate(_XML_ESCAPE_TABLE)
+
+
+class Templates(object):
+    """Format-specific fragments for one QTI version's assessmentTest."""
+    __slots__ = ('test_start', 'test_end', 'outcome_declaration',
+                 'test_part_start', 'test_part_end',
+                 'section_start', 'section_end',
+                 'ref_tag', 'sec_tag', 'sel_tag', 'order_tag',
+                 'static_prologue', 'epilogue', 'main_section_start')
+
+    def __init__(self, *, test_start: str, test_end: str,
+                 outcome_declaration: str,
+                 test_part_start: str, test_part_end: str,
+                 section_start: str, section_end: str,
+                 ref_tag: str, sec_tag: str, sel_tag: str, order_tag: str):
+        self.test_start = test_start
+        self.test_end = test_end
+        self.outcome_declaration = outcome_declaration
+        self.test_part_start = test_part_start
+        self.test_part_end = test_part_end
+        self.section_start = section_start
+        self.section_end = section_end
+        self.ref_tag = ref_tag
+        self.sec_tag = sec_tag
+        self.sel_tag = sel_tag
+        self.order_tag = order_tag
+        # Fixed fragments fused at construction so the hot path writes each
+        # of them with a single call
+        self.static_prologue = outcome_declaration + test_part_start
+        self.main_section_start = section_start.format(
+            identifier='main_section', title='Questions')
+        self.epilogue = section_end + test_part_end + test_end
+
+
+def _emit_text_region(item: TextRegion, w, t: Templates):
+    # Text regions - create a separate text-only item
+    w(f'      <{t.ref_tag} identifier="{item.xml_identifier}" href="../assessmentItems/{item.xml_filename}"/>\n')
+
+
+def _emit_group_start(item: GroupStart, w, t: Templates):
+    # Start a group (section with selection)
+    group = item.group
+    w(f'''    <{t.sec_tag} identifier="text2qti_group_{group.id}" title="{group.title_xml}" visible="true">
+      <{t.sel_tag} select="{group.pick}"/>
+      <{t.order_tag} shuffle="true"/>
+''')
+
+
+def _emit_group_end(item: GroupEnd, w, t: Templates):
+    # End a group
+    w(t.section_end)
+
+
+def _emit_question(item: Question, w, t: Templates):
+    # Regular question
+    w(f'      <{t.ref_tag} identifier="{item.xml_identifier}" href="../assessmentItems/{item.xml_filename}"/>\n')
+
+
+# Dispatch on exact type: one dict probe per item instead of a chain of
+# isinstance checks, since the quiz element types have no subclasses
+_EMITTERS = {
+    TextRegion: _emit_text_region,
+    GroupStart: _emit_group_start,
+    GroupEnd: _emit_group_end,
+    Question: _emit_question,
+}
+
+
+def assessment_test_impl(quiz: Quiz, test_identifier: str, t: Templates,
+                         out=None):
+    '''
+    Generate assessmentTest XML from Quiz using format-specific templates.
+
+    With `out`, fragments are written directly to the given text stream and
+    nothing is returned; otherwise the XML is returned as a string.
+    '''
+    if out is None:
+        buf = io.StringIO()
+        w = buf.write
+    else:
+        buf = None
+        w = out.write
+
+    # Start.  *_xml attributes are already escaped when they are set
+    # (markdown.Markdown.xml_escape), so they are inserted as-is.
+    w(t.test_start.format(
+        identifier=test_identifier,
+        title=quiz.title_xml
+    ))
+
+    # Outcome declaration (test-level score) and test part opening
+    w(t.static_prologue)
+
+    # Main assessment section containing all questions
+    w(t.main_section_start)
+
+    items = quiz.questions_and_delims
+    if len(quiz.questions) == len(items):
+        # Common case: no groups or text regions, so every entry is a
+        # question; emit all refs in one comprehension-fed join
+        ref_tag = t.ref_tag
+        w(''.join(
+            f'      <{ref_tag} identifier="{q.xml_identifier}" href="../assessmentItems/{q.xml_filename}"/>\n'
+            for q in items
+        ))
+    else:
+        # Process each question or delimiter; hot names bound to locals so
+        # the loop runs on fast-local loads
+        get_emitter = _EMITTERS.get
+        for item in items:
+            emitter = get_emitter(type(item))
+            if emitter is not None:
+                emitter(item, w, t)
+
+    # Close main section, test part, and assessment test
+    w(t.epilogue)
+
+    if buf is not None:
+        return buf.getvalue()
+    return None
@@ -14,9 +14,14 @@ For backward compatibility with QTI 1.2, the old implementation
 is preserved in qti12.py.
 """
 
-import io
-import pathlib
-from typing import BinaryIO, Union
+from __future__ import annotations
+
+import zipfile
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pathlib
+    from typing import BinaryIO, Optional, Union
 
 from .qti30_package import QTI30
 from .quiz import Quiz
@@ -34,14 +39,28 @@ class QTI(object):
         self._qti30 = QTI30(quiz)
         self.quiz = quiz
 
-    def write(self, bytes_stream: BinaryIO):
+    def write(self, bytes_stream: BinaryIO,
+              compression: int = zipfile.ZIP_DEFLATED,
+              compresslevel: Optional[int] = 1):
         """Write the QTI package to a binary stream."""
-        self._qti30.write(bytes_stream)
+        self._qti30.write(bytes_stream, compression=compression,
+                          compresslevel=compresslevel)
 
-    def zip_bytes(self) -> bytes:
+    def zip_bytes(self, compression: int = zipfile.ZIP_DEFLATED,
+                  compresslevel: Optional[int] = 1) -> bytes:
         """Get the QTI package as bytes."""
-        return self._qti30.zip_bytes()
+        return self._qti30.zip_bytes(compression=compression,
+                                     compresslevel=compresslevel)
+
+    def zip_buffer(self, compression: int = zipfile.ZIP_DEFLATED,
+                   compresslevel: Optional[int] = 1) -> memoryview:
+        """Get the QTI package as a zero-copy memoryview."""
+        return self._qti30.zip_buffer(compression=compression,
+                                      compresslevel=compresslevel)
 
-    def save(self, qti_path: Union[str, pathlib.Path]):
+    def save(self, qti_path: Union[str, pathlib.Path],
+             compression: int = zipfile.ZIP_DEFLATED,
+             compresslevel: Optional[int] = 1):
         """Save the QTI package to a file."""
-        self._qti30.save(qti_path)
+        self._qti30.save(qti_path, compression=compression,
+                         compresslevel=compresslevel)
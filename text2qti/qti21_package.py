@@ -14,7 +14,7 @@ Create QTI 2.1 packages from Quiz objects.
 import io
 import pathlib
 import zipfile
-from typing import BinaryIO, Union
+from typing import BinaryIO, Optional, Union
 
 from .quiz import Question, Quiz, TextRegion
 from .xml_assessment21 import create_assessment_item_from_question
@@ -22,6 +22,42 @@ from .xml_assessment_test21 import assessment_test, create_text_region_item
 from .xml_imsmanifest21 import imsmanifest21
 
 
+# Interaction types per question type, for manifest metadata
+_INTERACTION_TYPES = {
+    'true_false_question': ('choiceInteraction',),
+    'multiple_choice_question': ('choiceInteraction',),
+    'multiple_answers_question': ('choiceInteraction',),
+    'short_answer_question': ('textEntryInteraction',),
+    'numerical_question': ('textEntryInteraction',),
+    'essay_question': ('extendedTextInteraction',),
+    'file_upload_question': ('uploadInteraction',),
+}
+
+
+class _AssessmentItem(object):
+    """One package entry: either a question item (emitted on the fly) or
+    prebuilt XML for a text region.  Slots keep the per-entry footprint
+    small and make the write loop attribute accesses cheap."""
+
+    __slots__ = ('identifier', 'filename', 'item', 'xml', 'interaction_types')
+
+    def __init__(self, identifier: str, filename: str,
+                 item=None, xml: Optional[bytes] = None,
+                 interaction_types: tuple = ()):
+        self.identifier = identifier
+        self.filename = filename
+        self.item = item
+        self.xml = xml
+        self.interaction_types = interaction_types
+
+
+def _image_is_precompressed(data: bytes) -> bool:
+    """PNG, JPEG, GIF, and WebP payloads are already entropy-coded;
+    deflating them again burns CPU for under 1% size reduction."""
+    return (data.startswith((b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff', b'GIF87a', b'GIF89a'))
+            or (data[:4] == b'RIFF' and data[8:12] == b'WEBP'))
+
+
 class QTI21(object):
     '''
     Create QTI 2.1 package from a Quiz object.
@@ -34,93 +70,120 @@ class QTI21(object):
         self.test_filename = f'{self.test_identifier}.xml'
         
         # Generate assessment test XML
-        self.assessment_test_xml = assessment_test(
-            quiz=quiz,
-            test_identifier=self.test_identifier
-        )
-        
-        # Generate assessment items (questions)
+        # Generate assessment items (questions); the manifest reads these
+        # entries directly, so no separate resource list is built
         self.assessment_items = []
         for item in quiz.questions_and_delims:
             if isinstance(item, Question):
                 assessment_item = create_assessment_item_from_question(item)
-                self.assessment_items.append({
-                    'identifier': assessment_item.identifier,
-                    'filename': f'{assessment_item.identifier}.xml',
-                    'xml': assessment_item.to_xml(),
-                    'interaction_types': self._get_interaction_types(item)
-                })
+                identifier = assessment_item.identifier
+                self.assessment_items.append(_AssessmentItem(
+                    identifier, f'{identifier}.xml',
+                    item=assessment_item,
+                    interaction_types=self._get_interaction_types(item)
+                ))
             elif isinstance(item, TextRegion):
-                text_item_xml = create_text_region_item(item)
-                self.assessment_items.append({
-                    'identifier': f'text2qti_text_{item.id}',
-                    'filename': f'text2qti_text_{item.id}.xml',
-                    'xml': text_item_xml,
-                    'interaction_types': []
-                })
-        
-        # Prepare item resources for manifest
-        item_resources = []
-        for item in self.assessment_items:
-            item_resources.append({
-                'identifier': item['identifier'],
-                'file': item['filename'],
-                'interaction_types': item['interaction_types']
-            })
+                self.assessment_items.append(_AssessmentItem(
+                    item.xml_identifier, item.xml_filename,
+                    xml=create_text_region_item(item).encode('utf-8')
+                ))
         
         # Generate manifest
         self.imsmanifest_xml = imsmanifest21(
             manifest_identifier=self.manifest_identifier,
             test_identifier=self.test_identifier,
             test_file=self.test_filename,
-            item_resources=item_resources,
+            item_resources=self.assessment_items,
             images=self.quiz.images
         )
     
-    def _get_interaction_types(self, question: Question) -> list:
+    def _get_interaction_types(self, question: Question) -> tuple:
         """Get the interaction types for a question (for metadata)."""
-        type_map = {
-            'true_false_question': ['choiceInteraction'],
-            'multiple_choice_question': ['choiceInteraction'],
-            'multiple_answers_question': ['choiceInteraction'],
-            'short_answer_question': ['textEntryInteraction'],
-            'numerical_question': ['textEntryInteraction'],
-            'essay_question': ['extendedTextInteraction'],
-            'file_upload_question': ['uploadInteraction'],
-        }
-        return type_map.get(question.type, [])
+        return _INTERACTION_TYPES.get(question.type, ())
     
-    def write(self, bytes_stream: BinaryIO):
-        """Write the QTI 2.1 package to a stream."""
-        with zipfile.ZipFile(bytes_stream, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+    def write(self, bytes_stream: BinaryIO,
+              compression: int = zipfile.ZIP_DEFLATED,
+              compresslevel: Optional[int] = 1):
+        """Write the QTI 2.1 package to a stream.
+
+        The default fast deflate (level 1) compresses the XML nearly as
+        well as the zlib default while being several times faster; pass
+        `compression=zipfile.ZIP_STORED` to skip compression entirely.
+        """
+        # Coalesce zipfile's many small writes into 64 KiB chunks when
+        # writing to an unbuffered stream (BytesIO and buffered files are
+        # BufferedIOBase and don't need it)
+        stream = bytes_stream
+        if not isinstance(stream, io.BufferedIOBase):
+            stream = io.BufferedWriter(stream, buffer_size=65536)
+        with zipfile.ZipFile(stream, 'w', compression=compression,
+                             compresslevel=compresslevel) as zf:
             # Write manifest
             zf.writestr('imsmanifest.xml', self.imsmanifest_xml)
             
-            # Create directory structure (empty directories aren't stored, but we write marker files)
-            zf.writestr(zipfile.ZipInfo('assessmentTests/'), b'')
-            zf.writestr(zipfile.ZipInfo('assessmentItems/'), b'')
-            
-            # Write assessment test
-            zf.writestr(f'assessmentTests/{self.test_filename}', self.assessment_test_xml)
+            # Write assessment test, streaming fragments straight into the
+            # zip entry
+            with zf.open(f'assessmentTests/{self.test_filename}', 'w') as test_stream:
+                with io.TextIOWrapper(test_stream, encoding='utf-8', write_through=True) as text_stream:
+                    assessment_test(quiz=self.quiz, test_identifier=self.test_identifier, out=text_stream)
             
-            # Write assessment items
+            # Write assessment items, streaming emit() output straight into
+            # the zip entry instead of materializing the full XML string
             for item in self.assessment_items:
-                zf.writestr(f'assessmentItems/{item["filename"]}', item['xml'])
+                assessment_item = item.item
+                if assessment_item is not None:
+                    with zf.open(f'assessmentItems/{item.filename}', 'w') as item_stream:
+                        with io.TextIOWrapper(item_stream, encoding='utf-8', write_through=True) as text_stream:
+                            assessment_item.emit(text_stream.write)
+                else:
+                    # Prebuilt XML goes through the same entry-stream path
+                    # as emitted items, skipping writestr's internal copy
+                    with zf.open(f'assessmentItems/{item.filename}', 'w') as item_stream:
+                        item_stream.write(item.xml)
             
-            # Write images
+            # Write images; store already-compressed formats uncompressed
             for image in self.quiz.images.values():
-                zf.writestr(image.qti_zip_path, image.data)
+                if _image_is_precompressed(image.data):
+                    zf.writestr(image.qti_zip_path, image.data,
+                                compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.writestr(image.qti_zip_path, image.data)
+
+        if stream is not bytes_stream:
+            stream.flush()
     
-    def zip_bytes(self) -> bytes:
+    def zip_bytes(self, compression: int = zipfile.ZIP_DEFLATED,
+                  compresslevel: Optional[int] = 1) -> bytes:
         """Get the QTI 2.1 package as bytes."""
         stream = io.BytesIO()
-        self.write(stream)
+        self.write(stream, compression=compression, compresslevel=compresslevel)
         return stream.getvalue()
-    
-    def save(self, qti_path: Union[str, pathlib.Path]):
-        """Save the QTI 2.1 package to a file."""
+
+    def zip_buffer(self, compression: int = zipfile.ZIP_DEFLATED,
+                   compresslevel: Optional[int] = 1) -> memoryview:
+        """Get the QTI 2.1 package as a zero-copy memoryview.
+
+        Unlike `zip_bytes`, this avoids copying the package out of the
+        in-memory buffer; the view must be released before the caller
+        can discard it.
+        """
+        stream = io.BytesIO()
+        self.write(stream, compression=compression, compresslevel=compresslevel)
+        return stream.getbuffer()
+
+    def save(self, qti_path: Union[str, pathlib.Path],
+             compression: int = zipfile.ZIP_DEFLATED,
+             compresslevel: Optional[int] = 1):
+        """Save the QTI 2.1 package to a file.
+
+        The zip is streamed straight into the file instead of building
+        the whole package in memory first.
+        """
         if isinstance(qti_path, str):
             qti_path = pathlib.Path(qti_path)
         elif not isinstance(qti_path, pathlib.Path):
             raise TypeError
-        qti_path.write_bytes(self.zip_bytes())
+        # A larger buffer than the 8 KiB default cuts write() syscalls for
+        # zip payloads
+        with qti_path.open('wb', buffering=1 << 20) as f:
+            self.write(f, compression=compression, compresslevel=compresslevel)
@@ -12,20 +12,65 @@ QTI 3.0 classes for generating assessment items.
 Based on IMS QTI 3.0 specification.
 """
 
-from typing import List, Optional, Union
-
-
+from __future__ import annotations
+
+import functools
+import io
+import re
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Callable, List, Optional, Union
+
+
+# Matches `{gap_id}` placeholders in gap match question content
+GAP_PLACEHOLDER_RE = re.compile(r'\{([a-zA-Z0-9_]+)\}')
+
+# Fixed attribute literals, indexed by bool
+BOOL_ATTR = ('false', 'true')
+
+# Closed sets of attribute values from the QTI 3.0 spec; these are
+# validated at construction time and then interpolated without escaping
+CARDINALITIES = frozenset(['single', 'multiple', 'ordered', 'record'])
+BASE_TYPES = frozenset(['identifier', 'boolean', 'integer', 'float', 'string',
+                        'point', 'pair', 'directedPair', 'duration', 'file', 'uri'])
+SHOW_HIDE = frozenset(['show', 'hide'])
+
+# Constant prolog and namespace declarations shared by every item
+ITEM_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<qti-assessment-item\n'
+    '\txmlns="http://www.imsglobal.org/xsd/imsqtiasi_v3p0"\n'
+    '\txmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"\n'
+    '\txsi:schemaLocation="http://www.imsglobal.org/xsd/imsqtiasi_v3p0 https://purl.imsglobal.org/spec/qti/v3p0/schema/xsd/imsqti_asiv3p0_v1p0.xsd"\n'
+)
+
+XML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&apos;',
+})
+
+
+@functools.lru_cache(maxsize=4096)
 def xml_escape(s: str) -> str:
-    """Basic XML escaping for attributes and text content."""
-    return (s.replace('&', '&amp;')
-             .replace('<', '&lt;')
-             .replace('>', '&gt;')
-             .replace('"', '&quot;')
-             .replace("'", '&apos;'))
+    """Basic XML escaping for attributes and text content.
+
+    Cached since the same identifiers (RESPONSE, SCORE, choice ids, ...)
+    are escaped over and over within a package.
+    """
+    return s.translate(XML_ESCAPE_TABLE)
 
 
 class AssessmentItem:
     """QTI 3.0 qti-assessment-item - represents a single question/item."""
+
+    __slots__ = ('identifier', 'title', 'adaptive', 'time_dependent', 'language',
+                 'response_declarations', 'outcome_declarations', 'item_body',
+                 'response_processing', 'modal_feedbacks')
     
     def __init__(self, identifier: str, title: str, adaptive: bool = False, 
                  time_dependent: bool = False, language: Optional[str] = None):
@@ -34,16 +79,20 @@ class AssessmentItem:
         self.adaptive = adaptive
         self.time_dependent = time_dependent
         self.language = language
-        self.response_declarations: List[ResponseDeclaration] = []
-        self.outcome_declarations: List[OutcomeDeclaration] = []
+        # Lists are allocated lazily on first add_* call; many items
+        # never have modal feedback
+        self.response_declarations: Optional[List[ResponseDeclaration]] = None
+        self.outcome_declarations: Optional[List[OutcomeDeclaration]] = None
         self.item_body: Optional[ItemBody] = None
         self.response_processing: Optional[ResponseProcessing] = None
-        self.modal_feedbacks: List[ModalFeedback] = []
+        self.modal_feedbacks: Optional[List[ModalFeedback]] = None
     
     def add_response_declaration(self, identifier: str, cardinality: str, 
                                 base_type: str) -> 'ResponseDeclaration':
         """Add a response declaration (declares what type of response is expected)."""
         decl = ResponseDeclaration(identifier, cardinality, base_type)
+        if self.response_declarations is None:
+            self.response_declarations = []
         self.response_declarations.append(decl)
         return decl
     
@@ -51,6 +100,8 @@ class AssessmentItem:
                                base_type: str, default_value: Optional[str] = None) -> 'OutcomeDeclaration':
         """Add an outcome declaration (declares outcome variables like SCORE)."""
         decl = OutcomeDeclaration(identifier, cardinality, base_type, default_value)
+        if self.outcome_declarations is None:
+            self.outcome_declarations = []
         self.outcome_declarations.append(decl)
         return decl
     
@@ -64,107 +115,137 @@ class AssessmentItem:
     
     def add_modal_feedback(self, feedback: 'ModalFeedback'):
         """Add modal feedback (feedback shown to student)."""
+        if self.modal_feedbacks is None:
+            self.modal_feedbacks = []
         self.modal_feedbacks.append(feedback)
     
-    def to_xml(self) -> str:
-        """Generate QTI 3.0 XML for this assessment item."""
-        xml = []
-        xml.append('<?xml version="1.0" encoding="UTF-8"?>')
-        xml.append('<qti-assessment-item')
-        xml.append('\txmlns="http://www.imsglobal.org/xsd/imsqtiasi_v3p0"')
-        xml.append('\txmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"')
-        xml.append('\txsi:schemaLocation="http://www.imsglobal.org/xsd/imsqtiasi_v3p0 https://purl.imsglobal.org/spec/qti/v3p0/schema/xsd/imsqti_asiv3p0_v1p0.xsd"')
-        xml.append(f'\tidentifier="{xml_escape(self.identifier)}"')
-        xml.append(f'\ttitle="{xml_escape(self.title)}"')
-        xml.append(f'\tadaptive="{"true" if self.adaptive else "false"}"')
-        xml.append(f'\ttime-dependent="{"true" if self.time_dependent else "false"}"')
+    def emit(self, w: Callable[[str], object]):
+        """Write QTI 3.0 XML for this assessment item via `w`."""
+        w(ITEM_HEADER)
+        w(f'\tidentifier="{xml_escape(self.identifier)}"\n')
+        w(f'\ttitle="{xml_escape(self.title)}"\n')
+        w(f'\tadaptive="{BOOL_ATTR[self.adaptive]}"\n')
+        w(f'\ttime-dependent="{BOOL_ATTR[self.time_dependent]}"\n')
         if self.language:
-            xml.append(f'\txml:lang="{xml_escape(self.language)}"')
-        xml.append('>')
-        
+            w(f'\txml:lang="{xml_escape(self.language)}"\n')
+        w('>')
+
         # Response declarations
-        for decl in self.response_declarations:
-            xml.append(decl.to_xml())
-        
+        for decl in self.response_declarations or ():
+            w('\n')
+            decl.emit(w)
+
         # Outcome declarations
-        for decl in self.outcome_declarations:
-            xml.append(decl.to_xml())
-        
+        for decl in self.outcome_declarations or ():
+            w('\n')
+            decl.emit(w)
+
         # Item body
         if self.item_body:
-            xml.append(self.item_body.to_xml())
-        
+            w('\n')
+            self.item_body.emit(w)
+
         # Response processing
         if self.response_processing:
-            xml.append(self.response_processing.to_xml())
-        
+            w('\n')
+            self.response_processing.emit(w)
+
         # Modal feedback
-        for feedback in self.modal_feedbacks:
-            xml.append(feedback.to_xml())
-        
-        xml.append('</qti-assessment-item>')
-        return '\n'.join(xml)
+        for feedback in self.modal_feedbacks or ():
+            w('\n')
+            feedback.emit(w)
+
+        w('\n</qti-assessment-item>')
+
+    def to_xml(self) -> str:
+        """Generate QTI 3.0 XML for this assessment item."""
+        buf = io.StringIO()
+        self.emit(buf.write)
+        return buf.getvalue()
 
 
 class ResponseDeclaration:
     """Declares a response variable (what the student answers)."""
+
+    __slots__ = ('identifier', 'cardinality', 'base_type', 'correct_response')
     
     def __init__(self, identifier: str, cardinality: str, base_type: str):
-        self.identifier = identifier
-        self.cardinality = cardinality  # 'single', 'multiple', 'ordered'
-        self.base_type = base_type      # 'identifier', 'string', 'float', 'integer', etc.
+        if cardinality not in CARDINALITIES:
+            raise ValueError(f'Invalid cardinality "{cardinality}"')
+        if base_type not in BASE_TYPES:
+            raise ValueError(f'Invalid base-type "{base_type}"')
+        self.identifier = sys.intern(identifier)
+        self.cardinality = cardinality
+        self.base_type = base_type
         self.correct_response: Optional[List[str]] = None
     
     def set_correct_response(self, values: List[str]):
         """Set the correct response value(s)."""
         self.correct_response = values
     
-    def to_xml(self) -> str:
-        xml = [f'<qti-response-declaration identifier="{xml_escape(self.identifier)}" cardinality="{self.cardinality}" base-type="{self.base_type}"']
+    def emit(self, w: Callable[[str], object]):
+        attrs = f'identifier="{xml_escape(self.identifier)}" cardinality="{self.cardinality}" base-type="{self.base_type}"'
         if self.correct_response:
-            xml.append('>')
-            xml.append('<qti-correct-response>')
+            w(f'<qti-response-declaration {attrs}>')
+            w('\n<qti-correct-response>')
             for value in self.correct_response:
-                xml.append(f'<qti-value>{xml_escape(value)}</qti-value>')
-            xml.append('</qti-correct-response>')
-            xml.append('</qti-response-declaration>')
+                w(f'\n<qti-value>{xml_escape(value)}</qti-value>')
+            w('\n</qti-correct-response>')
+            w('\n</qti-response-declaration>')
         else:
-            xml.append('/>')
-        return '\n'.join(xml)
+            w(f'<qti-response-declaration {attrs}/>')
+
+    def to_xml(self) -> str:
+        buf = io.StringIO()
+        self.emit(buf.write)
+        return buf.getvalue()
 
 
 class OutcomeDeclaration:
     """Declares an outcome variable (like SCORE, FEEDBACK)."""
+
+    __slots__ = ('identifier', 'cardinality', 'base_type', 'default_value',
+                 'interpretation', 'normal_maximum')
     
-    def __init__(self, identifier: str, cardinality: str, base_type: str, 
+    def __init__(self, identifier: str, cardinality: str, base_type: str,
                  default_value: Optional[str] = None):
-        self.identifier = identifier
+        if cardinality not in CARDINALITIES:
+            raise ValueError(f'Invalid cardinality "{cardinality}"')
+        if base_type not in BASE_TYPES:
+            raise ValueError(f'Invalid base-type "{base_type}"')
+        self.identifier = sys.intern(identifier)
         self.cardinality = cardinality
         self.base_type = base_type
         self.default_value = default_value
         self.interpretation: Optional[str] = None
         self.normal_maximum: Optional[float] = None
     
-    def to_xml(self) -> str:
-        xml = [f'<qti-outcome-declaration identifier="{xml_escape(self.identifier)}" cardinality="{self.cardinality}" base-type="{self.base_type}"']
+    def emit(self, w: Callable[[str], object]):
+        attrs = f'identifier="{xml_escape(self.identifier)}" cardinality="{self.cardinality}" base-type="{self.base_type}"'
         if self.interpretation:
-            xml.append(f' interpretation="{xml_escape(self.interpretation)}"')
+            attrs += f' interpretation="{xml_escape(self.interpretation)}"'
         if self.normal_maximum is not None:
-            xml.append(f' normal-maximum="{self.normal_maximum}"')
-        
+            attrs += f' normal-maximum="{self.normal_maximum}"'
+
         if self.default_value:
-            xml.append('>')
-            xml.append('<qti-default-value>')
-            xml.append(f'<qti-value>{xml_escape(self.default_value)}</qti-value>')
-            xml.append('</qti-default-value>')
-            xml.append('</qti-outcome-declaration>')
+            w(f'<qti-outcome-declaration {attrs}>')
+            w('\n<qti-default-value>')
+            w(f'\n<qti-value>{xml_escape(self.default_value)}</qti-value>')
+            w('\n</qti-default-value>')
+            w('\n</qti-outcome-declaration>')
         else:
-            xml.append('/>')
-        return '\n'.join(xml)
+            w(f'<qti-outcome-declaration {attrs}/>')
+
+    def to_xml(self) -> str:
+        buf = io.StringIO()
+        self.emit(buf.write)
+        return buf.getvalue()
 
 
 class ItemBody:
     """The main content area of an assessment item."""
+
+    __slots__ = ('blocks',)
     
     def __init__(self):
         self.blocks: List[Union[str, 'Interaction']] = []
@@ -177,19 +258,26 @@ class ItemBody:
         """Add an interaction (question element)."""
         self.blocks.append(interaction)
     
-    def to_xml(self) -> str:
-        xml = ['<qti-item-body>']
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-item-body>')
         for block in self.blocks:
+            w('\n')
             if isinstance(block, str):
-                xml.append(block)
+                w(block)
             else:
-                xml.append(block.to_xml())
-        xml.append('</qti-item-body>')
-        return '\n'.join(xml)
+                block.emit(w)
+        w('\n</qti-item-body>')
+
+    def to_xml(self) -> str:
+        buf = io.StringIO()
+        self.emit(buf.write)
+        return buf.getvalue()
 
 
 class Interaction:
     """Base class for interactions."""
+
+    __slots__ = ('response_identifier', 'prompt')
     
     def __init__(self, response_identifier: str):
         self.response_identifier = response_identifier
@@ -199,13 +287,23 @@ class Interaction:
         """Set the prompt (question text)."""
         self.prompt = prompt
 
+    def emit(self, w: Callable[[str], object]):
+        raise NotImplementedError
+
+    def to_xml(self) -> str:
+        buf = io.StringIO()
+        self.emit(buf.write)
+        return buf.getvalue()
+
 
 class ChoiceInteraction(Interaction):
     """Multiple choice or true/false interaction."""
+
+    __slots__ = ('shuffle', 'max_choices', 'choices')
     
     def __init__(self, response_identifier: str, shuffle: bool = False, 
                  max_choices: int = 1):
-        super().__init__(response_identifier)
+        super().__init__(sys.intern(response_identifier))
         self.shuffle = shuffle
         self.max_choices = max_choices
         self.choices: List['SimpleChoice'] = []
@@ -216,36 +314,51 @@ class ChoiceInteraction(Interaction):
         self.choices.append(choice)
         return choice
     
-    def to_xml(self) -> str:
-        xml = [f'<qti-choice-interaction response-identifier="{xml_escape(self.response_identifier)}" shuffle="{"true" if self.shuffle else "false"}" max-choices="{self.max_choices}">']
+    def emit(self, w: Callable[[str], object]):
+        w(f'<qti-choice-interaction response-identifier="{xml_escape(self.response_identifier)}" shuffle="{BOOL_ATTR[self.shuffle]}" max-choices="{self.max_choices}">')
         if self.prompt:
-            xml.append(f'<qti-prompt>{self.prompt}</qti-prompt>')
+            w(f'\n<qti-prompt>{self.prompt}</qti-prompt>')
         for choice in self.choices:
-            xml.append(choice.to_xml())
-        xml.append('</qti-choice-interaction>')
-        return '\n'.join(xml)
+            w('\n')
+            choice.emit(w)
+        w('\n</qti-choice-interaction>')
+
+
+@functools.lru_cache(maxsize=4096)
+def _simple_choice_xml(identifier: str, content: str, fixed: bool) -> str:
+    fixed_attr = ' fixed="true"' if fixed else ''
+    return f'<qti-simple-choice identifier="{xml_escape(identifier)}"{fixed_attr}>{content}</qti-simple-choice>'
 
 
 class SimpleChoice:
     """A single choice in a choice interaction."""
+
+    __slots__ = ('identifier', 'content', 'fixed')
     
     def __init__(self, identifier: str, content: str, fixed: bool = False):
         self.identifier = identifier
         self.content = content
         self.fixed = fixed
     
+    def emit(self, w: Callable[[str], object]):
+        w(_simple_choice_xml(self.identifier, self.content, self.fixed))
+
     def to_xml(self) -> str:
-        fixed_attr = ' fixed="true"' if self.fixed else ''
-        return f'<qti-simple-choice identifier="{xml_escape(self.identifier)}"{fixed_attr}>{self.content}</qti-simple-choice>'
+        return _simple_choice_xml(self.identifier, self.content, self.fixed)
 
 
 class TextEntryInteraction(Interaction):
     """Text entry (fill-in-the-blank / short answer) interaction."""
+
+    __slots__ = ('expected_length',)
     
     def __init__(self, response_identifier: str, expected_length: Optional[int] = None):
         super().__init__(response_identifier)
         self.expected_length = expected_length
     
+    def emit(self, w: Callable[[str], object]):
+        w(self.to_xml())
+
     def to_xml(self) -> str:
         attrs = f'response-identifier="{xml_escape(self.response_identifier)}"'
         if self.expected_length:
@@ -255,6 +368,8 @@ class TextEntryInteraction(Interaction):
 
 class ExtendedTextInteraction(Interaction):
     """Extended text (essay) interaction."""
+
+    __slots__ = ('expected_lines', 'expected_length')
     
     def __init__(self, response_identifier: str, expected_lines: Optional[int] = None,
                  expected_length: Optional[int] = None):
@@ -262,44 +377,44 @@ class ExtendedTextInteraction(Interaction):
         self.expected_lines = expected_lines
         self.expected_length = expected_length
     
-    def to_xml(self) -> str:
-        xml = [f'<qti-extended-text-interaction response-identifier="{xml_escape(self.response_identifier)}"']
+    def emit(self, w: Callable[[str], object]):
+        attrs = f'response-identifier="{xml_escape(self.response_identifier)}"'
         if self.expected_lines:
-            xml.append(f' expected-lines="{self.expected_lines}"')
+            attrs += f' expected-lines="{self.expected_lines}"'
         if self.expected_length:
-            xml.append(f' expected-length="{self.expected_length}"')
-        
+            attrs += f' expected-length="{self.expected_length}"'
+
         if self.prompt:
-            xml.append('>')
-            xml.append(f'<qti-prompt>{self.prompt}</qti-prompt>')
-            xml.append('</qti-extended-text-interaction>')
+            w(f'<qti-extended-text-interaction {attrs}>')
+            w(f'\n<qti-prompt>{self.prompt}</qti-prompt>')
+            w('\n</qti-extended-text-interaction>')
         else:
-            xml.append('/>')
-        
-        return '\n'.join(xml)
+            w(f'<qti-extended-text-interaction {attrs}/>')
 
 
 class UploadInteraction(Interaction):
     """File upload interaction."""
+
+    __slots__ = ()
     
     def __init__(self, response_identifier: str):
         super().__init__(response_identifier)
     
-    def to_xml(self) -> str:
-        xml = [f'<qti-upload-interaction response-identifier="{xml_escape(self.response_identifier)}"']
-        
+    def emit(self, w: Callable[[str], object]):
+        attrs = f'response-identifier="{xml_escape(self.response_identifier)}"'
+
         if self.prompt:
-            xml.append('>')
-            xml.append(f'<qti-prompt>{self.prompt}</qti-prompt>')
-            xml.append('</qti-upload-interaction>')
+            w(f'<qti-upload-interaction {attrs}>')
+            w(f'\n<qti-prompt>{self.prompt}</qti-prompt>')
+            w('\n</qti-upload-interaction>')
         else:
-            xml.append('/>')
-        
-        return '\n'.join(xml)
+            w(f'<qti-upload-interaction {attrs}/>')
 
 
 class GapMatchInteraction(Interaction):
     """Gap match interaction - drag and drop words into gaps."""
+
+    __slots__ = ('shuffle', 'gap_texts', 'content_with_gaps')
     
     def __init__(self, response_identifier: str, shuffle: bool = False):
         super().__init__(response_identifier)
@@ -316,43 +431,55 @@ class GapMatchInteraction(Interaction):
     def set_content_with_gaps(self, content: str):
         """Set the content that contains {gap_id} placeholders."""
         # Replace {gap_id} with proper QTI gap elements
-        import re
         def replace_gap(match):
             gap_id = match.group(1)
             return f'<qti-gap identifier="{xml_escape(gap_id)}" />'
-        self.content_with_gaps = re.sub(r'\{([a-zA-Z0-9_]+)\}', replace_gap, content)
+        self.content_with_gaps = GAP_PLACEHOLDER_RE.sub(replace_gap, content)
     
-    def to_xml(self) -> str:
-        xml = [f'<qti-gap-match-interaction response-identifier="{xml_escape(self.response_identifier)}" shuffle="{"true" if self.shuffle else "false"}">']
+    def emit(self, w: Callable[[str], object]):
+        w(f'<qti-gap-match-interaction response-identifier="{xml_escape(self.response_identifier)}" shuffle="{BOOL_ATTR[self.shuffle]}">')
         if self.prompt:
-            xml.append(f'<qti-prompt>{self.prompt}</qti-prompt>')
-        
+            w(f'\n<qti-prompt>{self.prompt}</qti-prompt>')
+
         # Add gap texts (draggable options)
         for gap_text in self.gap_texts:
-            xml.append(gap_text.to_xml())
-        
+            w('\n')
+            gap_text.emit(w)
+
         # Add content with gaps
         if self.content_with_gaps:
-            xml.append(self.content_with_gaps)
-        
-        xml.append('</qti-gap-match-interaction>')
-        return '\n'.join(xml)
+            w('\n')
+            w(self.content_with_gaps)
+
+        w('\n</qti-gap-match-interaction>')
+
+
+@functools.lru_cache(maxsize=4096)
+def _gap_text_xml(identifier: str, text: str, match_max: int) -> str:
+    return f'<qti-gap-text identifier="{xml_escape(identifier)}" match-max="{match_max}">{xml_escape(text)}</qti-gap-text>'
 
 
 class GapText:
     """A draggable text option for gap match interaction."""
+
+    __slots__ = ('identifier', 'text', 'match_max')
     
     def __init__(self, identifier: str, text: str, match_max: int = 1):
         self.identifier = identifier
         self.text = text
         self.match_max = match_max
     
+    def emit(self, w: Callable[[str], object]):
+        w(_gap_text_xml(self.identifier, self.text, self.match_max))
+
     def to_xml(self) -> str:
-        return f'<qti-gap-text identifier="{xml_escape(self.identifier)}" match-max="{self.match_max}">{xml_escape(self.text)}</qti-gap-text>'
+        return _gap_text_xml(self.identifier, self.text, self.match_max)
 
 
 class ResponseProcessing:
     """Response processing - defines how responses are scored."""
+
+    __slots__ = ('rules',)
     
     def __init__(self):
         self.rules: List['ResponseRule'] = []
@@ -361,23 +488,38 @@ class ResponseProcessing:
         """Add a response rule."""
         self.rules.append(rule)
     
-    def to_xml(self) -> str:
-        xml = ['<qti-response-processing>']
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-response-processing>')
         for rule in self.rules:
-            xml.append(rule.to_xml())
-        xml.append('</qti-response-processing>')
-        return '\n'.join(xml)
+            w('\n')
+            rule.emit(w)
+        w('\n</qti-response-processing>')
+
+    def to_xml(self) -> str:
+        buf = io.StringIO()
+        self.emit(buf.write)
+        return buf.getvalue()
 
 
 class ResponseRule:
     """Base class for response rules."""
-    
+
+    __slots__ = ()
+
+    def emit(self, w: Callable[[str], object]):
+        # Sentinel: every concrete subclass must provide emit
+        raise NotImplementedError
+
     def to_xml(self) -> str:
-        return ''
+        buf = io.StringIO()
+        self.emit(buf.write)
+        return buf.getvalue()
 
 
 class ResponseCondition(ResponseRule):
     """Conditional response processing rule."""
+
+    __slots__ = ('response_if', 'response_else_ifs', 'response_else')
     
     def __init__(self):
         self.response_if: Optional['ResponseIf'] = None
@@ -393,224 +535,294 @@ class ResponseCondition(ResponseRule):
     def set_response_else(self, response_else: 'ResponseElse'):
         self.response_else = response_else
     
-    def to_xml(self) -> str:
-        xml = ['<qti-response-condition>']
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-response-condition>')
         if self.response_if:
-            xml.append(self.response_if.to_xml())
+            w('\n')
+            self.response_if.emit(w)
         for else_if in self.response_else_ifs:
-            xml.append(else_if.to_xml())
+            w('\n')
+            else_if.emit(w)
         if self.response_else:
-            xml.append(self.response_else.to_xml())
-        xml.append('</qti-response-condition>')
-        return '\n'.join(xml)
+            w('\n')
+            self.response_else.emit(w)
+        w('\n</qti-response-condition>')
 
 
-class ResponseIf:
-    """The 'if' part of a response condition."""
-    
-    def __init__(self, condition: 'Expression', actions: List['ResponseRule']):
+class _ConditionClause:
+    """Shared state and emit logic for the response condition clauses,
+    which differ only in tag name (and the 'else' clause's lack of a
+    condition)."""
+
+    __slots__ = ('condition', 'actions')
+
+    _tag = ''
+
+    def __init__(self, condition: Optional['Expression'], actions: List['ResponseRule']):
         self.condition = condition
         self.actions = actions
-    
-    def to_xml(self) -> str:
-        xml = ['<qti-response-if>']
-        xml.append(self.condition.to_xml())
+
+    def emit(self, w: Callable[[str], object]):
+        w(f'<{self._tag}>')
+        if self.condition is not None:
+            w('\n')
+            self.condition.emit(w)
         for action in self.actions:
-            xml.append(action.to_xml())
-        xml.append('</qti-response-if>')
-        return '\n'.join(xml)
+            w('\n')
+            action.emit(w)
+        w(f'\n</{self._tag}>')
+
+    def to_xml(self) -> str:
+        buf = io.StringIO()
+        self.emit(buf.write)
+        return buf.getvalue()
+
+
+class ResponseIf(_ConditionClause):
+    """The 'if' part of a response condition."""
+
+    __slots__ = ()
 
+    _tag = 'qti-response-if'
 
-class ResponseElseIf:
+
+class ResponseElseIf(_ConditionClause):
     """The 'else if' part of a response condition."""
-    
-    def __init__(self, condition: 'Expression', actions: List['ResponseRule']):
-        self.condition = condition
-        self.actions = actions
-    
-    def to_xml(self) -> str:
-        xml = ['<qti-response-else-if>']
-        xml.append(self.condition.to_xml())
-        for action in self.actions:
-            xml.append(action.to_xml())
-        xml.append('</qti-response-else-if>')
-        return '\n'.join(xml)
+
+    __slots__ = ()
+
+    _tag = 'qti-response-else-if'
 
 
-class ResponseElse:
+class ResponseElse(_ConditionClause):
     """The 'else' part of a response condition."""
-    
+
+    __slots__ = ()
+
+    _tag = 'qti-response-else'
+
     def __init__(self, actions: List['ResponseRule']):
-        self.actions = actions
-    
-    def to_xml(self) -> str:
-        xml = ['<qti-response-else>']
-        for action in self.actions:
-            xml.append(action.to_xml())
-        xml.append('</qti-response-else>')
-        return '\n'.join(xml)
+        super().__init__(None, actions)
 
 
 class SetOutcomeValue(ResponseRule):
     """Sets the value of an outcome variable."""
+
+    __slots__ = ('identifier', 'expression')
     
     def __init__(self, identifier: str, expression: 'Expression'):
         self.identifier = identifier
         self.expression = expression
     
-    def to_xml(self) -> str:
-        xml = [f'<qti-set-outcome-value identifier="{xml_escape(self.identifier)}">']
-        xml.append(self.expression.to_xml())
-        xml.append('</qti-set-outcome-value>')
-        return '\n'.join(xml)
+    def emit(self, w: Callable[[str], object]):
+        w(f'<qti-set-outcome-value identifier="{xml_escape(self.identifier)}">\n')
+        self.expression.emit(w)
+        w('\n</qti-set-outcome-value>')
 
 
 class Expression:
     """Base class for expressions."""
-    
+
+    __slots__ = ()
+
+    def emit(self, w: Callable[[str], object]):
+        # Sentinel: every concrete subclass must provide emit
+        raise NotImplementedError
+
     def to_xml(self) -> str:
-        return ''
+        buf = io.StringIO()
+        self.emit(buf.write)
+        return buf.getvalue()
 
 
 class Match(Expression):
     """Match expression - checks if two values are equal."""
+
+    __slots__ = ('left', 'right')
     
     def __init__(self, left: Expression, right: Expression):
         self.left = left
         self.right = right
     
-    def to_xml(self) -> str:
-        return f'<qti-match>{self.left.to_xml()}{self.right.to_xml()}</qti-match>'
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-match>')
+        self.left.emit(w)
+        self.right.emit(w)
+        w('</qti-match>')
+
+
+@functools.lru_cache(maxsize=4096)
+def _variable_xml(identifier: str) -> str:
+    return f'<qti-variable identifier="{xml_escape(identifier)}"/>'
 
 
 class Variable(Expression):
     """Variable reference expression."""
+
+    __slots__ = ('identifier',)
     
     def __init__(self, identifier: str):
         self.identifier = identifier
     
-    def to_xml(self) -> str:
-        return f'<qti-variable identifier="{xml_escape(self.identifier)}"/>'
+    def emit(self, w: Callable[[str], object]):
+        w(_variable_xml(self.identifier))
+
+
+@functools.lru_cache(maxsize=4096)
+def _base_value_xml(base_type: str, value: str) -> str:
+    return f'<qti-base-value base-type="{base_type}">{xml_escape(value)}</qti-base-value>'
 
 
 class BaseValue(Expression):
     """Literal value expression."""
+
+    __slots__ = ('base_type', 'value')
     
     def __init__(self, base_type: str, value: str):
         self.base_type = base_type
         self.value = value
     
-    def to_xml(self) -> str:
-        return f'<qti-base-value base-type="{self.base_type}">{xml_escape(self.value)}</qti-base-value>'
+    def emit(self, w: Callable[[str], object]):
+        w(_base_value_xml(self.base_type, self.value))
 
 
 class Multiple(Expression):
     """Multiple expression - creates a container with multiple values."""
+
+    __slots__ = ('values',)
     
     def __init__(self, values: List[Expression]):
         self.values = values
     
-    def to_xml(self) -> str:
-        xml = ['<qti-multiple>']
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-multiple>')
         for value in self.values:
-            xml.append(value.to_xml())
-        xml.append('</qti-multiple>')
-        return '\n'.join(xml)
+            w('\n')
+            value.emit(w)
+        w('\n</qti-multiple>')
 
 
 class And(Expression):
     """AND logical operator."""
+
+    __slots__ = ('expressions',)
     
     def __init__(self, expressions: List[Expression]):
         self.expressions = expressions
     
-    def to_xml(self) -> str:
-        xml = ['<qti-and>']
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-and>')
         for expr in self.expressions:
-            xml.append(expr.to_xml())
-        xml.append('</qti-and>')
-        return '\n'.join(xml)
+            w('\n')
+            expr.emit(w)
+        w('\n</qti-and>')
 
 
 class Or(Expression):
     """OR logical operator."""
+
+    __slots__ = ('expressions',)
     
     def __init__(self, expressions: List[Expression]):
         self.expressions = expressions
     
-    def to_xml(self) -> str:
-        xml = ['<qti-or>']
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-or>')
         for expr in self.expressions:
-            xml.append(expr.to_xml())
-        xml.append('</qti-or>')
-        return '\n'.join(xml)
+            w('\n')
+            expr.emit(w)
+        w('\n</qti-or>')
 
 
 class Not(Expression):
     """NOT logical operator."""
+
+    __slots__ = ('expression',)
     
     def __init__(self, expression: Expression):
         self.expression = expression
     
-    def to_xml(self) -> str:
-        return f'<qti-not>{self.expression.to_xml()}</qti-not>'
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-not>')
+        self.expression.emit(w)
+        w('</qti-not>')
 
 
 class Sum(Expression):
     """Sum expression - adds values together."""
+
+    __slots__ = ('expressions',)
     
     def __init__(self, expressions: List[Expression]):
         self.expressions = expressions
     
-    def to_xml(self) -> str:
-        xml = ['<qti-sum>']
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-sum>')
         for expr in self.expressions:
-            xml.append(expr.to_xml())
-        xml.append('</qti-sum>')
-        return '\n'.join(xml)
+            w('\n')
+            expr.emit(w)
+        w('\n</qti-sum>')
 
 
 class Gte(Expression):
     """Greater than or equal expression."""
+
+    __slots__ = ('left', 'right')
     
     def __init__(self, left: Expression, right: Expression):
         self.left = left
         self.right = right
     
-    def to_xml(self) -> str:
-        return f'<qti-gte>{self.left.to_xml()}{self.right.to_xml()}</qti-gte>'
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-gte>')
+        self.left.emit(w)
+        self.right.emit(w)
+        w('</qti-gte>')
 
 
 class Lte(Expression):
     """Less than or equal expression."""
+
+    __slots__ = ('left', 'right')
     
     def __init__(self, left: Expression, right: Expression):
         self.left = left
         self.right = right
     
-    def to_xml(self) -> str:
-        return f'<qti-lte>{self.left.to_xml()}{self.right.to_xml()}</qti-lte>'
+    def emit(self, w: Callable[[str], object]):
+        w('<qti-lte>')
+        self.left.emit(w)
+        self.right.emit(w)
+        w('</qti-lte>')
 
 
 class ModalFeedback:
     """Modal feedback shown to the student."""
+
+    __slots__ = ('identifier', 'outcome_identifier', 'show_hide', 'content')
     
-    def __init__(self, identifier: str, outcome_identifier: str = 'FEEDBACK', 
+    def __init__(self, identifier: str, outcome_identifier: str = 'FEEDBACK',
                  show_hide: str = 'show'):
+        if show_hide not in SHOW_HIDE:
+            raise ValueError(f'Invalid show-hide "{show_hide}"')
         self.identifier = identifier
         self.outcome_identifier = outcome_identifier
-        self.show_hide = show_hide  # 'show' or 'hide'
+        self.show_hide = show_hide
         self.content: str = ''
     
     def set_content(self, content: str):
         """Set the feedback content (HTML)."""
         self.content = content
     
-    def to_xml(self) -> str:
+    def emit(self, w: Callable[[str], object]):
         # QTI 3.0: modalFeedback content must be wrapped in qti-content-body
-        xml = [f'<qti-modal-feedback outcome-identifier="{xml_escape(self.outcome_identifier)}" identifier="{xml_escape(self.identifier)}" show-hide="{self.show_hide}">']
-        xml.append('<qti-content-body>')
-        xml.append(self.content)
-        xml.append('</qti-content-body>')
-        xml.append('</qti-modal-feedback>')
-        return '\n'.join(xml)
+        w(f'<qti-modal-feedback outcome-identifier="{xml_escape(self.outcome_identifier)}" identifier="{xml_escape(self.identifier)}" show-hide="{self.show_hide}">\n')
+        w('<qti-content-body>\n')
+        w(self.content)
+        w('\n</qti-content-body>')
+        w('\n</qti-modal-feedback>')
+
+    def to_xml(self) -> str:
+        buf = io.StringIO()
+        self.emit(buf.write)
+        return buf.getvalue()
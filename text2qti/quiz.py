@@ -14,6 +14,7 @@ of which contains a list of Choice objects.
 '''
 
 
+import functools
 import hashlib
 import io
 import itertools
@@ -128,6 +129,20 @@ class TextRegion(object):
         h.update(self.text_html_xml.encode('utf8'))
         self.id = h.hexdigest()[:64]
 
+    @functools.cached_property
+    def xml_identifier(self) -> str:
+        '''
+        Identifier for this text region's assessment item XML.
+        '''
+        return f'text2qti_text_{self.id}'
+
+    @functools.cached_property
+    def xml_filename(self) -> str:
+        '''
+        Filename for this text region's assessment item XML.
+        '''
+        return f'{self.xml_identifier}.xml'
+
     def set_title(self, text: str):
         if self.title_raw is not None:
             raise Text2qtiError('Text title has already been set')
@@ -485,6 +500,20 @@ class Question(object):
             raise Text2qtiError('Invalid numerical response; all acceptable values must have a magnitude >= 0.0001')
 
 
+    @functools.cached_property
+    def xml_identifier(self) -> str:
+        '''
+        Identifier for this question's assessment item XML.
+        '''
+        return f'text2qti_question_{self.id}'
+
+    @functools.cached_property
+    def xml_filename(self) -> str:
+        '''
+        Filename for this question's assessment item XML.
+        '''
+        return f'{self.xml_identifier}.xml'
+
     def finalize(self):
         if self.type is None:
             raise Text2qtiError('Question must specify a response type')
@@ -822,6 +851,13 @@ class Quiz(object):
         finally:
             self.md.finalize()
 
+    @functools.cached_property
+    def questions(self) -> List[Question]:
+        '''
+        All questions, without group delims and text regions.
+        '''
+        return [q for q in self.questions_and_delims if isinstance(q, Question)]
+
     def _run_code(self, executable: str, code: str) -> str:
         if not self.config['run_code_blocks']:
             raise Text2qtiError('Code execution for code blocks is not enabled; use --run-code-blocks, or set run_code_blocks = true in config')
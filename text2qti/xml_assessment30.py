@@ -11,6 +11,8 @@
 Generate QTI 3.0 assessment items from Quiz objects.
 """
 
+import functools
+
 from .qti30 import (And, AssessmentItem, BaseValue, ChoiceInteraction,
                     ExtendedTextInteraction, GapMatchInteraction, Gte, ItemBody, Lte, Match,
                     ModalFeedback, Multiple, Not, ResponseCondition,
@@ -20,10 +22,86 @@ from .qti30 import (And, AssessmentItem, BaseValue, ChoiceInteraction,
 from .quiz import GroupEnd, GroupStart, Question, Quiz, TextRegion
 
 
+@functools.lru_cache(maxsize=4096)
+def _choice_identifier(choice_id: str) -> str:
+    """Identifier for a choice; cached since each choice's id is needed at
+    several sites (interaction, response processing, feedback)."""
+    return f'text2qti_choice_{choice_id}'
+
+
+@functools.lru_cache(maxsize=4096)
+def _choice_feedback_identifier(choice_id: str) -> str:
+    """Identifier for a choice's per-choice feedback."""
+    return f'text2qti_choice_{choice_id}_fb'
+
+
+@functools.lru_cache(maxsize=4096)
+def _choice_base_value(choice_id: str) -> BaseValue:
+    """Shared BaseValue for a choice identifier; BaseValue is immutable in
+    use, so response processing can reuse one instance per choice."""
+    return BaseValue('identifier', _choice_identifier(choice_id))
+
+
+# Constant response-processing actions; these are immutable in use, so a
+# single shared instance of each is enough
+_RESPONSE_VAR = Variable('RESPONSE')
+_FB_CORRECT = SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'correct_fb'))
+_FB_INCORRECT = SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'incorrect_fb'))
+_FB_GENERAL = SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
+
+
+@functools.lru_cache(maxsize=1024)
+def _score_action(points) -> SetOutcomeValue:
+    """Shared SCORE action per distinct points value; caching on the raw
+    value also memoizes the number-to-string conversion."""
+    return SetOutcomeValue('SCORE', BaseValue('float', str(points)))
+
+
+def _item_cache_key(question: Question) -> tuple:
+    """
+    Canonical content key for an assessment item.
+
+    `question.id` alone hashes only the question text, so the key also
+    covers everything else the item is built from: choices, points,
+    feedback, numerical range, and gap match data.
+    """
+    return (
+        question.type,
+        question.title_xml,
+        question.question_html_xml,
+        question.points_possible,
+        question.feedback_html_xml,
+        question.correct_feedback_html_xml,
+        question.incorrect_feedback_html_xml,
+        tuple((c.id, getattr(c, 'choice_html_xml', None), getattr(c, 'choice_xml', None),
+               c.correct, c.feedback_html_xml)
+              for c in question.choices),
+        question.numerical_min,
+        question.numerical_max,
+        tuple((g['identifier'], g['text']) for g in question.gap_texts),
+        tuple((m['gap_text_id'], m['gap_id']) for m in question.gap_matches),
+    )
+
+
+_item_cache = {}
+
+
 def create_assessment_item_from_question(question: Question) -> AssessmentItem:
     """
     Convert a Question object to a QTI 3.0 AssessmentItem.
+
+    Items are pure functions of question content, so identical questions
+    (question banks reused across quizzes in one process) share a single
+    cached AssessmentItem instead of rebuilding the object graph.
     """
+    key = _item_cache_key(question)
+    item = _item_cache.get(key)
+    if item is None:
+        item = _item_cache[key] = _create_assessment_item_from_question(question)
+    return item
+
+
+def _create_assessment_item_from_question(question: Question) -> AssessmentItem:
     # Create the assessment item
     item = AssessmentItem(
         identifier=f'text2qti_question_{question.id}',
@@ -57,8 +135,9 @@ def create_assessment_item_from_question(question: Question) -> AssessmentItem:
     item_body = ItemBody()
     
     # Add question content and interaction based on type
+    choice_feedbacks = []
     if question.type in ('true_false_question', 'multiple_choice_question', 'multiple_answers_question'):
-        interaction = create_choice_interaction(question)
+        interaction, choice_feedbacks = create_choice_interaction(question)
         item_body.add_interaction(interaction)
     elif question.type == 'short_answer_question':
         # Add question text as HTML
@@ -91,13 +170,17 @@ def create_assessment_item_from_question(question: Question) -> AssessmentItem:
         item.set_response_processing(response_processing)
     
     # Add modal feedback
-    add_modal_feedback(item, question)
+    add_modal_feedback(item, question, choice_feedbacks)
     
     return item
 
 
-def create_choice_interaction(question: Question) -> ChoiceInteraction:
-    """Create a choice interaction for MC/TF/multiple answer questions."""
+def create_choice_interaction(question: Question):
+    """Create a choice interaction for MC/TF/multiple answer questions.
+
+    Returns the interaction plus any per-choice ModalFeedback, built in
+    the same pass over the choices.
+    """
     shuffle = False  # Could be made configurable
     
     if question.type == 'multiple_answers_question':
@@ -108,10 +191,15 @@ def create_choice_interaction(question: Question) -> ChoiceInteraction:
     interaction = ChoiceInteraction('RESPONSE', shuffle=shuffle, max_choices=max_choices)
     interaction.set_prompt(question.question_html_xml)
     
+    choice_feedbacks = []
     for choice in question.choices:
-        interaction.add_choice(f'text2qti_choice_{choice.id}', choice.choice_html_xml)
+        interaction.add_choice(_choice_identifier(choice.id), choice.choice_html_xml)
+        if choice.feedback_raw:
+            feedback = ModalFeedback(_choice_feedback_identifier(choice.id), 'FEEDBACK', 'show')
+            feedback.set_content(choice.feedback_html_xml)
+            choice_feedbacks.append(feedback)
     
-    return interaction
+    return interaction, choice_feedbacks
 
 
 def create_gap_match_interaction(question: Question) -> GapMatchInteraction:
@@ -130,302 +218,260 @@ def create_gap_match_interaction(question: Question) -> GapMatchInteraction:
     return interaction
 
 
-def create_response_processing(question: Question) -> ResponseProcessing:
-    """Create response processing logic for a question."""
-    rp = ResponseProcessing()
-    
-    if question.type in ('true_false_question', 'multiple_choice_question'):
-        # Single correct answer
-        correct_choice = next((c for c in question.choices if c.correct), None)
-        if not correct_choice:
-            return rp
-        
-        # Create response condition
-        rc = ResponseCondition()
-        
-        # If correct
-        correct_match = Match(
-            Variable('RESPONSE'),
-            BaseValue('identifier', f'text2qti_choice_{correct_choice.id}')
+def _first_correct(choices):
+    """First correct choice, or None.
+
+    A plain loop avoids the generator frame that `next(<genexp>)`
+    allocates per question."""
+    for choice in choices:
+        if choice.correct:
+            return choice
+    return None
+
+
+def _feedback_actions(question: Question, choice_feedback_id=None):
+    """
+    Build the correct/incorrect feedback action lists shared by the scored
+    branches of `create_response_processing`.  `choice_feedback_id` adds
+    per-choice feedback for the correct choice (true/false and multiple
+    choice questions).
+    """
+    has_general_fb = question.feedback_raw
+    actions_correct = [_score_action(question.points_possible)]
+    if question.correct_feedback_raw:
+        actions_correct.append(_FB_CORRECT)
+    if choice_feedback_id is not None:
+        actions_correct.append(
+            SetOutcomeValue('FEEDBACK', BaseValue('identifier', choice_feedback_id))
         )
-        
-        actions_correct = [
-            SetOutcomeValue('SCORE', BaseValue('float', str(question.points_possible)))
-        ]
-        
-        # Add feedback identifier if there is correct feedback
-        if question.correct_feedback_raw:
-            actions_correct.append(
-                SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'correct_fb'))
-            )
-        
-        # Add individual choice feedback if present
-        if correct_choice.feedback_raw:
-            actions_correct.append(
-                SetOutcomeValue('FEEDBACK', BaseValue('identifier', f'text2qti_choice_{correct_choice.id}_fb'))
-            )
-        
-        # Add general feedback if present
-        if question.feedback_raw:
-            actions_correct.append(
-                SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
+    if has_general_fb:
+        actions_correct.append(_FB_GENERAL)
+    actions_incorrect = []
+    if question.incorrect_feedback_raw:
+        actions_incorrect.append(_FB_INCORRECT)
+    if has_general_fb:
+        actions_incorrect.append(_FB_GENERAL)
+    return actions_correct, actions_incorrect
+
+
+def _rp_choice(question: Question, rp: ResponseProcessing):
+    """Scoring for true/false and multiple choice questions."""
+    choices = question.choices
+    # Single correct answer
+    correct_choice = _first_correct(choices)
+    if not correct_choice:
+        return
+
+    # Create response condition
+    rc = ResponseCondition()
+
+    # If correct
+    correct_match = Match(
+        _RESPONSE_VAR,
+        _choice_base_value(correct_choice.id)
+    )
+
+    actions_correct, actions_incorrect = _feedback_actions(
+        question,
+        choice_feedback_id=(_choice_feedback_identifier(correct_choice.id)
+                            if correct_choice.feedback_raw else None)
+    )
+
+    rc.set_response_if(ResponseIf(correct_match, actions_correct))
+
+    # Else (incorrect)
+    if actions_incorrect:
+        rc.set_response_else(ResponseElse(actions_incorrect))
+
+    # Add choice-specific feedback for incorrect choices
+    for choice in choices:
+        if not choice.correct and choice.feedback_raw:
+            choice_match = Match(
+                _RESPONSE_VAR,
+                _choice_base_value(choice.id)
             )
-        
-        rc.set_response_if(ResponseIf(correct_match, actions_correct))
-        
-        # Else (incorrect)
-        if question.incorrect_feedback_raw or question.feedback_raw:
-            actions_incorrect = []
-            if question.incorrect_feedback_raw:
-                actions_incorrect.append(
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'incorrect_fb'))
-                )
-            if question.feedback_raw:
-                actions_incorrect.append(
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
-                )
-            rc.set_response_else(ResponseElse(actions_incorrect))
-        
-        # Add choice-specific feedback for incorrect choices
-        for choice in question.choices:
-            if not choice.correct and choice.feedback_raw:
-                choice_match = Match(
-                    Variable('RESPONSE'),
-                    BaseValue('identifier', f'text2qti_choice_{choice.id}')
-                )
-                actions_choice = [
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', f'text2qti_choice_{choice.id}_fb'))
-                ]
-                rc.add_response_else_if(ResponseElseIf(choice_match, actions_choice))
-        
-        rp.add_rule(rc)
-    
-    elif question.type == 'multiple_answers_question':
-        # Multiple correct answers - check all must be selected
-        rc = ResponseCondition()
-        
-        # Build AND condition: all correct choices selected, no incorrect choices selected
-        conditions = []
-        
-        for choice in question.choices:
-            if choice.correct:
-                # This choice should be selected
-                conditions.append(Match(
-                    Variable('RESPONSE'),
-                    BaseValue('identifier', f'text2qti_choice_{choice.id}')
-                ))
-            else:
-                # This choice should NOT be selected
-                conditions.append(Not(Match(
-                    Variable('RESPONSE'),
-                    BaseValue('identifier', f'text2qti_choice_{choice.id}')
-                )))
-        
-        if len(conditions) > 1:
-            all_correct = And(conditions)
-        else:
-            all_correct = conditions[0] if conditions else None
-        
-        if all_correct:
-            actions_correct = [
-                SetOutcomeValue('SCORE', BaseValue('float', str(question.points_possible)))
+            actions_choice = [
+                SetOutcomeValue('FEEDBACK', BaseValue('identifier', _choice_feedback_identifier(choice.id)))
             ]
-            
-            if question.correct_feedback_raw:
-                actions_correct.append(
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'correct_fb'))
-                )
-            if question.feedback_raw:
-                actions_correct.append(
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
-                )
-            
-            rc.set_response_if(ResponseIf(all_correct, actions_correct))
-            
-            # Else (incorrect)
-            if question.incorrect_feedback_raw or question.feedback_raw:
-                actions_incorrect = []
-                if question.incorrect_feedback_raw:
-                    actions_incorrect.append(
-                        SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'incorrect_fb'))
-                    )
-                if question.feedback_raw:
-                    actions_incorrect.append(
-                        SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
-                    )
-                rc.set_response_else(ResponseElse(actions_incorrect))
-            
-            rp.add_rule(rc)
-    
-    elif question.type == 'short_answer_question':
-        # Multiple possible correct answers (string matching)
-        rc = ResponseCondition()
-        
-        # Create OR condition for all correct answers
-        if len(question.choices) == 1:
-            # Single correct answer
-            correct_match = Match(
-                Variable('RESPONSE'),
-                BaseValue('string', question.choices[0].choice_xml)
-            )
+            rc.add_response_else_if(ResponseElseIf(choice_match, actions_choice))
+
+    rp.add_rule(rc)
+
+
+def _rp_multiple_answers(question: Question, rp: ResponseProcessing):
+    """Scoring for multiple answers questions."""
+    choices = question.choices
+    # Multiple correct answers - check all must be selected
+    rc = ResponseCondition()
+
+    # Build AND condition: all correct choices selected, no incorrect choices selected
+    conditions = []
+
+    for choice in choices:
+        if choice.correct:
+            # This choice should be selected
+            conditions.append(Match(
+                _RESPONSE_VAR,
+                _choice_base_value(choice.id)
+            ))
         else:
-            # Multiple acceptable answers - check each one
-            # In QTI 3.0, we need to check each possibility
-            # For simplicity, check the first one in responseIf, others in responseElseIf
-            correct_match = Match(
-                Variable('RESPONSE'),
-                BaseValue('string', question.choices[0].choice_xml)
-            )
-        
-        actions_correct = [
-            SetOutcomeValue('SCORE', BaseValue('float', str(question.points_possible)))
-        ]
-        
-        if question.correct_feedback_raw:
-            actions_correct.append(
-                SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'correct_fb'))
-            )
-        if question.feedback_raw:
-            actions_correct.append(
-                SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
-            )
-        
-        rc.set_response_if(ResponseIf(correct_match, actions_correct))
-        
-        # Add additional correct answers as elseif
-        for i, choice in enumerate(question.choices[1:], start=1):
-            alt_match = Match(
-                Variable('RESPONSE'),
-                BaseValue('string', choice.choice_xml)
-            )
-            rc.add_response_else_if(ResponseElseIf(alt_match, actions_correct))
-        
+            # This choice should NOT be selected
+            conditions.append(Not(Match(
+                _RESPONSE_VAR,
+                _choice_base_value(choice.id)
+            )))
+
+    if len(conditions) > 1:
+        all_correct = And(conditions)
+    else:
+        all_correct = conditions[0] if conditions else None
+
+    if all_correct:
+        actions_correct, actions_incorrect = _feedback_actions(question)
+
+        rc.set_response_if(ResponseIf(all_correct, actions_correct))
+
         # Else (incorrect)
-        if question.incorrect_feedback_raw or question.feedback_raw:
-            actions_incorrect = []
-            if question.incorrect_feedback_raw:
-                actions_incorrect.append(
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'incorrect_fb'))
-                )
-            if question.feedback_raw:
-                actions_incorrect.append(
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
-                )
+        if actions_incorrect:
             rc.set_response_else(ResponseElse(actions_incorrect))
-        
+
         rp.add_rule(rc)
-    
-    elif question.type == 'numerical_question':
-        # Numerical answer within range
+
+
+def _rp_short_answer(question: Question, rp: ResponseProcessing):
+    """Scoring for short answer questions."""
+    choices = question.choices
+    # Multiple possible correct answers (string matching)
+    rc = ResponseCondition()
+
+    # Create OR condition for all correct answers
+    if len(choices) == 1:
+        # Single correct answer
+        correct_match = Match(
+            _RESPONSE_VAR,
+            BaseValue('string', choices[0].choice_xml)
+        )
+    else:
+        # Multiple acceptable answers - check each one
+        # In QTI 3.0, we need to check each possibility
+        # For simplicity, check the first one in responseIf, others in responseElseIf
+        correct_match = Match(
+            _RESPONSE_VAR,
+            BaseValue('string', choices[0].choice_xml)
+        )
+
+    actions_correct, actions_incorrect = _feedback_actions(question)
+
+    rc.set_response_if(ResponseIf(correct_match, actions_correct))
+
+    # Add additional correct answers as elseif
+    for i, choice in enumerate(choices[1:], start=1):
+        alt_match = Match(
+            _RESPONSE_VAR,
+            BaseValue('string', choice.choice_xml)
+        )
+        rc.add_response_else_if(ResponseElseIf(alt_match, actions_correct))
+
+    # Else (incorrect)
+    if actions_incorrect:
+        rc.set_response_else(ResponseElse(actions_incorrect))
+
+    rp.add_rule(rc)
+
+
+def _rp_numerical(question: Question, rp: ResponseProcessing):
+    """Scoring for numerical questions."""
+    # Numerical answer within range
+    rc = ResponseCondition()
+
+    # Check if response is within acceptable range
+    in_range_conditions = [
+        Gte(_RESPONSE_VAR, BaseValue('float', str(question.numerical_min))),
+        Lte(_RESPONSE_VAR, BaseValue('float', str(question.numerical_max)))
+    ]
+
+    in_range = And(in_range_conditions)
+
+    actions_correct, actions_incorrect = _feedback_actions(question)
+
+    rc.set_response_if(ResponseIf(in_range, actions_correct))
+
+    # Else (incorrect/out of range)
+    if actions_incorrect:
+        rc.set_response_else(ResponseElse(actions_incorrect))
+
+    rp.add_rule(rc)
+
+
+def _rp_essay_upload(question: Question, rp: ResponseProcessing):
+    """Feedback-only processing for essay and file upload questions."""
+    # No automatic scoring for essays/uploads, just add feedback if present
+    if question.feedback_raw:
         rc = ResponseCondition()
-        
-        # Check if response is within acceptable range
-        in_range_conditions = [
-            Gte(Variable('RESPONSE'), BaseValue('float', str(question.numerical_min))),
-            Lte(Variable('RESPONSE'), BaseValue('float', str(question.numerical_max)))
-        ]
-        
-        in_range = And(in_range_conditions)
-        
-        actions_correct = [
-            SetOutcomeValue('SCORE', BaseValue('float', str(question.points_possible)))
-        ]
-        
-        if question.correct_feedback_raw:
-            actions_correct.append(
-                SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'correct_fb'))
-            )
-        if question.feedback_raw:
-            actions_correct.append(
-                SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
-            )
-        
-        rc.set_response_if(ResponseIf(in_range, actions_correct))
-        
-        # Else (incorrect/out of range)
-        if question.incorrect_feedback_raw or question.feedback_raw:
-            actions_incorrect = []
-            if question.incorrect_feedback_raw:
-                actions_incorrect.append(
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'incorrect_fb'))
-                )
-            if question.feedback_raw:
-                actions_incorrect.append(
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
-                )
+        # Always show general feedback
+        actions = [_FB_GENERAL]
+        # For essay/upload, we use a simple "always true" condition
+        # by checking if RESPONSE is defined (has any value)
+        rc.set_response_if(ResponseIf(
+            _RESPONSE_VAR,  # This evaluates to true if response exists
+            actions
+        ))
+        rp.add_rule(rc)
+
+
+def _rp_gap_match(question: Question, rp: ResponseProcessing):
+    """Scoring for gap match questions."""
+    # Gap match - check if all correct pairs are matched
+    rc = ResponseCondition()
+
+    # Build AND condition: all correct matches present
+    conditions = []
+    for match in question.gap_matches:
+        # Check if this directed pair exists in the response
+        conditions.append(Match(
+            _RESPONSE_VAR,
+            BaseValue('directedPair', f"{match['gap_text_id']} {match['gap_id']}")
+        ))
+
+    if len(conditions) > 1:
+        all_correct = And(conditions)
+    else:
+        all_correct = conditions[0] if conditions else None
+
+    if all_correct:
+        actions_correct, actions_incorrect = _feedback_actions(question)
+
+        rc.set_response_if(ResponseIf(all_correct, actions_correct))
+
+        # Else (incorrect)
+        if actions_incorrect:
             rc.set_response_else(ResponseElse(actions_incorrect))
-        
+
         rp.add_rule(rc)
-    
-    elif question.type in ('essay_question', 'file_upload_question'):
-        # No automatic scoring for essays/uploads, just add feedback if present
-        if question.feedback_raw:
-            rc = ResponseCondition()
-            # Always show general feedback
-            actions = [
-                SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
-            ]
-            # For essay/upload, we use a simple "always true" condition
-            # by checking if RESPONSE is defined (has any value)
-            rc.set_response_if(ResponseIf(
-                Variable('RESPONSE'),  # This evaluates to true if response exists
-                actions
-            ))
-            rp.add_rule(rc)
-    
-    elif question.type == 'gap_match_question':
-        # Gap match - check if all correct pairs are matched
-        rc = ResponseCondition()
-        
-        # Build AND condition: all correct matches present
-        conditions = []
-        for match in question.gap_matches:
-            # Check if this directed pair exists in the response
-            conditions.append(Match(
-                Variable('RESPONSE'),
-                BaseValue('directedPair', f"{match['gap_text_id']} {match['gap_id']}")
-            ))
-        
-        if len(conditions) > 1:
-            all_correct = And(conditions)
-        else:
-            all_correct = conditions[0] if conditions else None
-        
-        if all_correct:
-            actions_correct = [
-                SetOutcomeValue('SCORE', BaseValue('float', str(question.points_possible)))
-            ]
-            
-            if question.correct_feedback_raw:
-                actions_correct.append(
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'correct_fb'))
-                )
-            if question.feedback_raw:
-                actions_correct.append(
-                    SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
-                )
-            
-            rc.set_response_if(ResponseIf(all_correct, actions_correct))
-            
-            # Else (incorrect)
-            if question.incorrect_feedback_raw or question.feedback_raw:
-                actions_incorrect = []
-                if question.incorrect_feedback_raw:
-                    actions_incorrect.append(
-                        SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'incorrect_fb'))
-                    )
-                if question.feedback_raw:
-                    actions_incorrect.append(
-                        SetOutcomeValue('FEEDBACK', BaseValue('identifier', 'general_fb'))
-                    )
-                rc.set_response_else(ResponseElse(actions_incorrect))
-            
-            rp.add_rule(rc)
-    
-    return rp
 
+# Response processing builders by question type; unknown types get empty
+# response processing
+_RP_BUILDERS = {
+    'true_false_question': _rp_choice,
+    'multiple_choice_question': _rp_choice,
+    'multiple_answers_question': _rp_multiple_answers,
+    'short_answer_question': _rp_short_answer,
+    'numerical_question': _rp_numerical,
+    'essay_question': _rp_essay_upload,
+    'file_upload_question': _rp_essay_upload,
+    'gap_match_question': _rp_gap_match,
+}
 
-def add_modal_feedback(item: AssessmentItem, question: Question):
+
+def create_response_processing(question: Question) -> ResponseProcessing:
+    """Create response processing logic for a question."""
+    rp = ResponseProcessing()
+    builder = _RP_BUILDERS.get(question.type)
+    if builder is not None:
+        builder(question, rp)
+    return rp
+
+def add_modal_feedback(item: AssessmentItem, question: Question, choice_feedbacks=()):
     """Add modal feedback to an assessment item."""
     
     # General feedback (shown always or based on conditions)
@@ -446,10 +492,6 @@ def add_modal_feedback(item: AssessmentItem, question: Question):
         feedback.set_content(question.incorrect_feedback_html_xml)
         item.add_modal_feedback(feedback)
     
-    # Individual choice feedback
-    if question.type in ('true_false_question', 'multiple_choice_question', 'multiple_answers_question'):
-        for choice in question.choices:
-            if choice.feedback_raw:
-                feedback = ModalFeedback(f'text2qti_choice_{choice.id}_fb', 'FEEDBACK', 'show')
-                feedback.set_content(choice.feedback_html_xml)
-                item.add_modal_feedback(feedback)
+    # Individual choice feedback, collected during the choice interaction pass
+    for feedback in choice_feedbacks:
+        item.add_modal_feedback(feedback)
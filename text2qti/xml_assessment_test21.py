@@ -11,16 +11,8 @@
 Generate QTI 2.1 assessmentTest XML.
 """
 
-from .quiz import GroupEnd, GroupStart, Question, Quiz, TextRegion
-
-
-def xml_escape(s: str) -> str:
-    """Basic XML escaping."""
-    return (s.replace('&', '&amp;')
-             .replace('<', '&lt;')
-             .replace('>', '&gt;')
-             .replace('"', '&quot;')
-             .replace("'", '&apos;'))
+from ._xml_assessment_test import Templates, assessment_test_impl, xml_escape
+from .quiz import Quiz, TextRegion
 
 
 ASSESSMENT_TEST_START = '''\
@@ -60,94 +52,31 @@ ASSESSMENT_SECTION_END = '''\
     </assessmentSection>
 '''
 
-ASSESSMENT_SECTION_WITH_SELECTION = '''\
-    <assessmentSection identifier="{identifier}" title="{title}" visible="true">
-      <selection select="{select}"/>
-      <ordering shuffle="true"/>
-'''
-
-ASSESSMENT_ITEM_REF = '''\
-      <assessmentItemRef identifier="{identifier}" href="../assessmentItems/{filename}"/>
-'''
 
-TEXT_ITEM_REF = '''\
-      <assessmentItemRef identifier="{identifier}" href="../assessmentItems/{filename}"/>
-'''
+_TEMPLATES = Templates(
+    test_start=ASSESSMENT_TEST_START,
+    test_end=ASSESSMENT_TEST_END,
+    outcome_declaration=OUTCOME_DECLARATION,
+    test_part_start=TEST_PART_START,
+    test_part_end=TEST_PART_END,
+    section_start=ASSESSMENT_SECTION_START,
+    section_end=ASSESSMENT_SECTION_END,
+    ref_tag='assessmentItemRef',
+    sec_tag='assessmentSection',
+    sel_tag='selection',
+    order_tag='ordering',
+)
 
 
-def assessment_test(*, quiz: Quiz, test_identifier: str) -> str:
+def assessment_test(*, quiz: Quiz, test_identifier: str, out=None):
     '''
     Generate assessmentTest XML from Quiz.
-    
+
     The assessmentTest is the QTI 2.1 wrapper that organizes items into sections
-    and defines test-level settings.
+    and defines test-level settings.  With `out`, the XML is written to the
+    given text stream instead of being returned as a string.
     '''
-    xml = []
-    
-    # Start
-    xml.append(ASSESSMENT_TEST_START.format(
-        identifier=test_identifier,
-        title=xml_escape(quiz.title_xml)
-    ))
-    
-    # Outcome declarations (test-level score)
-    xml.append(OUTCOME_DECLARATION)
-    
-    # Test part (most QTI 2.1 tests have a single test part)
-    xml.append(TEST_PART_START)
-    
-    # Main assessment section containing all questions
-    xml.append(ASSESSMENT_SECTION_START.format(
-        identifier='main_section',
-        title='Questions'
-    ))
-    
-    # Track if we're inside a group
-    in_group = False
-    
-    # Process each question or delimiter
-    for item in quiz.questions_and_delims:
-        if isinstance(item, TextRegion):
-            # Text regions - create a separate text-only item
-            filename = f'text2qti_text_{item.id}.xml'
-            xml.append(TEXT_ITEM_REF.format(
-                identifier=f'text2qti_text_{item.id}',
-                filename=filename
-            ))
-        
-        elif isinstance(item, GroupStart):
-            # Start a group (section with selection)
-            group = item.group
-            xml.append(ASSESSMENT_SECTION_WITH_SELECTION.format(
-                identifier=f'text2qti_group_{group.id}',
-                title=xml_escape(group.title_xml),
-                select=str(group.pick)
-            ))
-            in_group = True
-        
-        elif isinstance(item, GroupEnd):
-            # End a group
-            xml.append(ASSESSMENT_SECTION_END)
-            in_group = False
-        
-        elif isinstance(item, Question):
-            # Regular question
-            filename = f'text2qti_question_{item.id}.xml'
-            xml.append(ASSESSMENT_ITEM_REF.format(
-                identifier=f'text2qti_question_{item.id}',
-                filename=filename
-            ))
-    
-    # Close main section
-    xml.append(ASSESSMENT_SECTION_END)
-    
-    # Close test part
-    xml.append(TEST_PART_END)
-    
-    # Close assessment test
-    xml.append(ASSESSMENT_TEST_END)
-    
-    return ''.join(xml)
+    return assessment_test_impl(quiz, test_identifier, _TEMPLATES, out=out)
 
 
 def create_text_region_item(text_region: TextRegion) -> str:
@@ -155,34 +84,23 @@ def create_text_region_item(text_region: TextRegion) -> str:
     Create a text-only assessment item for text regions.
     These are non-scored informational sections.
     """
-    xml = []
-    xml.append('<?xml version="1.0" encoding="UTF-8"?>')
-    xml.append('<assessmentItem')
-    xml.append('\txmlns="http://www.imsglobal.org/xsd/imsqti_v2p1"')
-    xml.append('\txmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"')
-    xml.append('\txsi:schemaLocation="http://www.imsglobal.org/xsd/imsqti_v2p1 http://www.imsglobal.org/xsd/imsqti_v2p1.xsd"')
-    xml.append(f'\tidentifier="text2qti_text_{text_region.id}"')
-    xml.append(f'\ttitle="{xml_escape(text_region.title_xml)}"')
-    xml.append('\tadaptive="false"')
-    xml.append('\ttimeDependent="false">')
-    
-    # No response declaration for text-only items
-    
-    # Outcome for score (always 0)
-    xml.append('<outcomeDeclaration identifier="SCORE" cardinality="single" baseType="float">')
-    xml.append('<defaultValue><value>0</value></defaultValue>')
-    xml.append('</outcomeDeclaration>')
-    
-    # Item body with just text content
-    xml.append('<itemBody>')
-    xml.append(f'<div class="text-region">')
-    if text_region.title_xml:
-        xml.append(f'<h3>{xml_escape(text_region.title_xml)}</h3>')
-    xml.append(text_region.text_html_xml)
-    xml.append('</div>')
-    xml.append('</itemBody>')
-    
-    # No response processing needed for text-only
-    
-    xml.append('</assessmentItem>')
-    return '\n'.join(xml)
+    # Optional heading, only emitted when the region has a title
+    h3 = f'<h3>{text_region.title_xml}</h3>\n' if text_region.title_xml else ''
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<assessmentItem
+\txmlns="http://www.imsglobal.org/xsd/imsqti_v2p1"
+\txmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+\txsi:schemaLocation="http://www.imsglobal.org/xsd/imsqti_v2p1 http://www.imsglobal.org/xsd/imsqti_v2p1.xsd"
+\tidentifier="{text_region.xml_identifier}"
+\ttitle="{text_region.title_xml}"
+\tadaptive="false"
+\ttimeDependent="false">
+<outcomeDeclaration identifier="SCORE" cardinality="single" baseType="float">
+<defaultValue><value>0</value></defaultValue>
+</outcomeDeclaration>
+<itemBody>
+<div class="text-region">
+{h3}{text_region.text_html_xml}
+</div>
+</itemBody>
+</assessmentItem>'''
@@ -12,7 +12,7 @@ Generate IMS Content Package manifest for QTI 2.1.
 """
 
 import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 
 from .markdown import Image
 
@@ -100,7 +100,7 @@ def imsmanifest21(*,
                   manifest_identifier: str,
                   test_identifier: str,
                   test_file: str,
-                  item_resources: List[Dict[str, str]],
+                  item_resources: list,
                   images: Dict[str, Image],
                   date: Optional[str] = None) -> str:
     '''
@@ -110,7 +110,8 @@ def imsmanifest21(*,
         manifest_identifier: Unique identifier for the manifest
         test_identifier: Identifier for the assessment test
         test_file: Filename of the assessment test XML
-        item_resources: List of dicts with 'identifier', 'file', and 'interaction_types' keys
+        item_resources: Assessment item entries with identifier, filename,
+            and interaction_types attributes
         images: Dictionary of images to include
         date: ISO date string (defaults to today)
     '''
@@ -129,12 +130,12 @@ def imsmanifest21(*,
     # Add assessment item resources
     for item in item_resources:
         interaction_types_xml = ''
-        for int_type in item.get('interaction_types', []):
+        for int_type in item.interaction_types:
             interaction_types_xml += f'          <imsqti:interactionType>{int_type}</imsqti:interactionType>\n'
         
         xml.append(ASSESSMENT_ITEM_RESOURCE.format(
-            item_identifier=item['identifier'],
-            item_file=item['file'],
+            item_identifier=item.identifier,
+            item_file=item.filename,
             interaction_types=interaction_types_xml.rstrip()
         ))
     
@@ -12,7 +12,7 @@ Generate IMS Content Package manifest for QTI 3.0.
 """
 
 import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 
 from .markdown import Image
 
@@ -82,7 +82,7 @@ def imsmanifest30(*,
                   manifest_identifier: str,
                   test_identifier: str,
                   test_file: str,
-                  item_resources: List[Dict[str, str]],
+                  item_resources: list,
                   images: Dict[str, Image],
                   date: Optional[str] = None) -> str:
     '''
@@ -92,7 +92,8 @@ def imsmanifest30(*,
         manifest_identifier: Unique identifier for the manifest
         test_identifier: Identifier for the assessment test
         test_file: Filename of the assessment test XML
-        item_resources: List of dicts with 'identifier' and 'file' keys
+        item_resources: Assessment item entries with identifier and
+            filename attributes
         images: Dictionary of images to include
         date: ISO date string (defaults to today)
     '''
@@ -111,8 +112,8 @@ def imsmanifest30(*,
     # Add assessment item resources
     for item in item_resources:
         xml.append(ASSESSMENT_ITEM_RESOURCE.format(
-            item_identifier=item['identifier'],
-            item_file=item['file']
+            item_identifier=item.identifier,
+            item_file=item.filename
         ))
     
     # Add image resources